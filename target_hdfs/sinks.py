@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-import os.path
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 from target_parquet.sinks import ParquetSink
@@ -13,6 +14,19 @@ from target_hdfs.utils.hdfs import (
 )
 from target_hdfs.utils.parquet import get_parquet_files
 
+DEFAULT_UPLOAD_CONCURRENCY = min(8, os.cpu_count() or 1)
+
+# In-flight background upload for each HDFS destination path. It is shared by all the sinks,
+# so a new sink of the same stream (e.g. after a schema change) waits for it before listing HDFS
+PENDING_UPLOADS: dict[str, Future] = {}
+
+
+def wait_for_pending_uploads() -> None:
+    """Wait for the in-flight uploads of all the streams, raising the error of a failed one."""
+    while PENDING_UPLOADS:
+        _, pending_upload = PENDING_UPLOADS.popitem()
+        pending_upload.result()
+
 
 class CanNotUploadFileError(Exception):
     """Can not upload file error."""
@@ -28,6 +42,21 @@ class HDFSSink(ParquetSink):
             self.config["hdfs_destination_path"], self.stream_name
         )
         self.skip_existing_files = self.config.get("skip_existing_files", False)
+        upload_concurrency = self.config.get(
+            "hdfs_upload_concurrency", DEFAULT_UPLOAD_CONCURRENCY
+        )
+        try:
+            # The setting may come as a string (e.g. from an environment variable)
+            self.upload_concurrency = int(upload_concurrency)
+        except (TypeError, ValueError):
+            self.upload_concurrency = 0
+        if self.upload_concurrency < 1:
+            raise ValueError(
+                "hdfs_upload_concurrency must be an integer of at least 1, "
+                f"got {upload_concurrency!r}"
+            )
+        # The previous sink of this stream may still be uploading the file we would append to
+        self.wait_for_upload()
         # Don't read the most recent file if partition_cols is set or if skip_existing_files is set
         hdfs_file = (
             read_most_recent_file(
@@ -42,9 +71,15 @@ class HDFSSink(ParquetSink):
         # pyarrow_df is used by target-parquet (super class) as a temporary storage for the data
         # (updated on every batch where it is converted from a list of records to a pyarrow table)
         self.pyarrow_df = hdfs_file.get("content")
+        # Uploads run in a single background thread so the next batch can be processed while
+        # the previous file is being sent to HDFS
+        self.upload_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"hdfs-upload-{self.stream_name}"
+        )
+        self.upload_in_background = True
 
     def upload_files(self) -> None:
-        """Upload a local file to HDFS."""
+        """Upload the local files to HDFS."""
         local_parquet_files = get_parquet_files(self.destination_path)
 
         if len(local_parquet_files) > 1 and self.hdfs_file_path:
@@ -54,18 +89,50 @@ class HDFSSink(ParquetSink):
             )
 
         self.logger.debug(f"Uploading {local_parquet_files} to HDFS")
-        for file in local_parquet_files:
-            hdfs_file_path = self.hdfs_file_path or os.path.join(
-                self.hdfs_destination_path,
-                os.path.relpath(file, self.destination_path),
-            )
-            upload_to_hdfs(file, hdfs_file_path)
-            Path(file).unlink()
+        if len(local_parquet_files) == 1:
+            self.upload_file(local_parquet_files[0])
+        elif local_parquet_files:
+            # Partitioned streams write one file per partition, upload them concurrently
+            max_workers = min(self.upload_concurrency, len(local_parquet_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Consume the results to re-raise any upload error
+                list(executor.map(self.upload_file, local_parquet_files))
 
         # Reset hdfs_file_path to None after uploading (no file to append)
         self.hdfs_file_path = None
 
+    def upload_file(self, file: str) -> None:
+        """Upload a single local file to HDFS and remove it from the local path."""
+        hdfs_file_path = self.hdfs_file_path or os.path.join(
+            self.hdfs_destination_path,
+            os.path.relpath(file, self.destination_path),
+        )
+        upload_to_hdfs(file, hdfs_file_path)
+        Path(file).unlink()
+
+    def wait_for_upload(self) -> None:
+        """Wait for the in-flight upload of this stream (if any), raising its error if it failed."""
+        pending_upload = PENDING_UPLOADS.pop(self.hdfs_destination_path, None)
+        if pending_upload is not None:
+            pending_upload.result()
+
     def write_file(self) -> None:
-        """Write a local file and upload to hdfs."""
+        """Write a local file and upload to hdfs (in the background until the sink is cleaned up)."""
+        # The previous upload must be done before writing: upload_files picks up every local file
+        self.wait_for_upload()
         super().write_file()
-        self.upload_files()
+        if self.upload_in_background:
+            PENDING_UPLOADS[self.hdfs_destination_path] = self.upload_executor.submit(
+                self.upload_files
+            )
+        else:
+            self.upload_files()
+
+    def clean_up(self) -> None:
+        """Wait for the background upload, then write and upload the remaining records."""
+        if self.upload_in_background:
+            # Files written from now on (e.g. by the super class clean up) are uploaded synchronously
+            self.upload_in_background = False
+            self.upload_executor.shutdown()
+            self.wait_for_upload()
+        super().clean_up()
@@ -7,6 +7,7 @@ from target_parquet.target import TargetParquet
 
 from target_hdfs.sinks import (
     HDFSSink,
+    wait_for_pending_uploads,
 )
 
 
@@ -42,11 +43,24 @@ class TargetHDFS(TargetParquet):
                     description="If set to true, the data will not be appended to the existing file",
                     default=False,
                 ),
+                th.Property(
+                    "hdfs_upload_concurrency",
+                    th.IntegerType,
+                    description="Max number of files uploaded to HDFS at the same time "
+                    "(at least 1) "
+                    "(default: min(8, number of CPUs))",
+                ),
             ).to_dict()
         )
 
     default_sink_class = HDFSSink
 
+    def _write_state_message(self, state: dict) -> None:
+        """Emit the state message once the files it covers are uploaded to HDFS."""
+        # Uploads run in the background, a failed one must not be covered by the bookmark
+        wait_for_pending_uploads()
+        super()._write_state_message(state)
+
 
 if __name__ == "__main__":
     TargetHDFS.cli()
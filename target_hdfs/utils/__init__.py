@@ -1,22 +1,13 @@
-import re
+# Bit shift for each size unit (k = 2^10, m = 2^20, g = 2^30)
+SIZE_UNIT_SHIFTS = {"": 0, "k": 10, "m": 20, "g": 30}
 
 
 def convert_size_to_bytes(size_str: str) -> int:
-    """Convert a size string to bytes."""
-    match = re.match(r"(\d+)([KkMmGg]?)", size_str)
-    if not match:
+    """Convert a size string (e.g. 200M, 1g or 134217728) to bytes."""
+    size = size_str.strip().lower().removesuffix("b")
+    value = size.rstrip("kmg")
+    unit = size[len(value) :]
+    if not value.isdecimal() or unit not in SIZE_UNIT_SHIFTS:
         raise ValueError(f"Invalid size string: {size_str}")
 
-    value, unit = match.groups()
-    value = int(value)
-
-    if unit.lower() == "k":
-        value *= 1024
-    elif unit.lower() == "m":
-        value *= 1024 * 1024
-    elif unit.lower() == "g":
-        value *= 1024 * 1024 * 1024
-    else:
-        raise ValueError(f"Invalid unit: {unit}")
-
-    return value
+    return int(value) << SIZE_UNIT_SHIFTS[unit]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import cache
 from subprocess import run
-from tempfile import NamedTemporaryFile
 from typing import TypedDict
+from xml.etree import ElementTree
 
 import pyarrow as pa
 from pyarrow._fs import FileInfo, FileType
@@ -13,6 +15,9 @@ from target_hdfs.utils import convert_size_to_bytes
 
 logger = logging.getLogger(__name__)
 
+# Size of the chunks copied to HDFS on upload (copy_files default is 1 MiB)
+UPLOAD_BUFFER_SIZE = 8 * 1024 * 1024
+
 
 class SchemaChangedError(Exception):
     """Exception for schema change."""
@@ -31,28 +36,48 @@ def get_hdfs_client() -> pa.fs.HadoopFileSystem:
     return pa.fs.HadoopFileSystem("default")
 
 
+def get_hadoop_conf_dir() -> str | None:
+    """Get the Hadoop configuration directory from the environment."""
+    if "HADOOP_CONF_DIR" in os.environ:
+        return os.environ["HADOOP_CONF_DIR"]
+    if "HADOOP_HOME" in os.environ:
+        return os.path.join(os.environ["HADOOP_HOME"], "etc", "hadoop")
+    return None
+
+
+def read_hdfs_block_size_from_config() -> int | None:
+    """Read dfs.blocksize from hdfs-site.xml (None if it is not set there)."""
+    hadoop_conf_dir = get_hadoop_conf_dir()
+    if not hadoop_conf_dir:
+        return None
+    hdfs_site_path = os.path.join(hadoop_conf_dir, "hdfs-site.xml")
+    try:
+        hdfs_site = ElementTree.parse(hdfs_site_path)  # noqa: S314
+    except (OSError, ElementTree.ParseError):
+        return None
+    for hdfs_property in hdfs_site.getroot().iter("property"):
+        if (hdfs_property.findtext("name") or "").strip() == "dfs.blocksize":
+            try:
+                return convert_size_to_bytes(hdfs_property.findtext("value") or "")
+            except ValueError:
+                # e.g. t/p suffixes or ${...} substitutions, resolved by hdfs getconf
+                return None
+    return None
+
+
 @cache
 def get_hdfs_block_size() -> int:
-    """Run the HDFS getconf command to get HDFS blocksize."""
-    cmd = ["hdfs", "getconf", "-confKey", "dfs.blocksize"]
-    result = run(cmd, capture_output=True, text=True, check=True)
-    hdfs_block_size = int(convert_size_to_bytes(result.stdout.strip()))
+    """Get the HDFS blocksize from hdfs-site.xml or, if not set, from the HDFS getconf command."""
+    hdfs_block_size = read_hdfs_block_size_from_config()
+    if hdfs_block_size is None:
+        # Not set in hdfs-site.xml, ask HDFS (slow, it starts a JVM) to also get the default value
+        cmd = ["hdfs", "getconf", "-confKey", "dfs.blocksize"]
+        result = run(cmd, capture_output=True, text=True, check=True)
+        hdfs_block_size = convert_size_to_bytes(result.stdout.strip())
     logger.info(f"HDFS block size: {hdfs_block_size} bytes")
     return hdfs_block_size
 
 
-def download_from_hdfs(source_path_hdfs: str, local_path: str) -> None:
-    """Download a file from HDFS."""
-    logger.debug(f"Uploading file from HDFS: {source_path_hdfs} ")
-    pa.fs.copy_files(
-        source_path_hdfs,
-        local_path,
-        source_filesystem=get_hdfs_client(),
-        destination_filesystem=pa.fs.LocalFileSystem(),
-    )
-    logger.debug(f"File {source_path_hdfs} downloaded from hdfs to {local_path} ")
-
-
 def upload_to_hdfs(local_file: str, destination_path_hdfs: str) -> None:
     """Upload a local file to HDFS."""
     logger.debug(f"Uploading file to HDFS: {destination_path_hdfs} ")
@@ -62,6 +87,7 @@ def upload_to_hdfs(local_file: str, destination_path_hdfs: str) -> None:
         new_hdfs_file,
         source_filesystem=pa.fs.LocalFileSystem(),
         destination_filesystem=get_hdfs_client(),
+        chunk_size=UPLOAD_BUFFER_SIZE,
     )
     replace_old_file_with_new_file(new_hdfs_file)
     logger.info(f"File {destination_path_hdfs} uploaded to HDFS")
@@ -70,16 +96,21 @@ def upload_to_hdfs(local_file: str, destination_path_hdfs: str) -> None:
 def replace_old_file_with_new_file(new_file_path: str) -> None:
     """Replace the old file with the new file in HDFS."""
     hdfs_client = get_hdfs_client()
-    hdfs_client.move(new_file_path, new_file_path.replace("_new", ""))
+    # Only strip the suffix, "_new" can also be part of the stream or directory name
+    hdfs_client.move(new_file_path, new_file_path.removesuffix("_new"))
 
 
 def get_files(hdfs_path: str, extension: str = ".parquet") -> list[FileInfo]:
     """Get all parquet files in a given HDFS path."""
-    hdfs_client = get_hdfs_client()
-    if hdfs_client.get_file_info(hdfs_path).type == FileType.NotFound:
-        return []
-    file_list = hdfs_client.get_file_info(pa.fs.FileSelector(hdfs_path))
-    return [file for file in file_list if file.base_name.endswith(extension)]
+    # allow_not_found avoids an extra RPC to check that the path exists
+    file_list = get_hdfs_client().get_file_info(
+        pa.fs.FileSelector(hdfs_path, allow_not_found=True)
+    )
+    return [
+        file
+        for file in file_list
+        if file.type == FileType.File and file.base_name.endswith(extension)
+    ]
 
 
 def get_most_recent_file(hdfs_path: str) -> FileInfo | None:
@@ -94,24 +125,33 @@ def read_most_recent_file(
     hdfs_block_size_limit: str | None,
 ) -> HDFSFile | None:
     """Read the last file from HDFS."""
-    block_size_limit = (
-        convert_size_to_bytes(hdfs_block_size_limit)
-        if hdfs_block_size_limit
-        else get_hdfs_block_size() * 0.85
-    )
-    most_recent_file = get_most_recent_file(hdfs_file_path)
+    block_size_limit: float
+    if hdfs_block_size_limit:
+        block_size_limit = convert_size_to_bytes(hdfs_block_size_limit)
+        most_recent_file = get_most_recent_file(hdfs_file_path)
+    else:
+        # The block size query (hdfs CLI) and the listing (NameNode RPC) don't depend on each other
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hdfs_block_size = executor.submit(get_hdfs_block_size)
+            most_recent_file_info = executor.submit(
+                get_most_recent_file, hdfs_file_path
+            )
+            block_size_limit = hdfs_block_size.result() * 0.85
+            most_recent_file = most_recent_file_info.result()
 
     # Force creates a new file if the last file is larger than 85% of the HDFS block size or does not exist
     if not most_recent_file or (most_recent_file.size >= block_size_limit):
         return None
 
-    with NamedTemporaryFile("wb") as tmp_file:
-        download_from_hdfs(most_recent_file.path, tmp_file.name)
-        parquet_df = pa.parquet.read_table(tmp_file.name)
-        if parquet_df.schema != pyarrow_schema:
+    # Read the file straight from HDFS (no local copy)
+    with get_hdfs_client().open_input_file(most_recent_file.path) as hdfs_file:
+        # Check the schema stored in the file footer before decoding the whole file
+        file_schema = pa.parquet.read_schema(hdfs_file)
+        if file_schema != pyarrow_schema:
             raise SchemaChangedError(
                 f"Schema of the file {most_recent_file.path} does not match the expected schema.\n"
-                f"Schema of the file: \n{parquet_df.schema}\n"
+                f"Schema of the file: \n{file_schema}\n"
                 f"Schema of the stream: \n{pyarrow_schema}"
             )
+        parquet_df = pa.parquet.read_table(hdfs_file)
         return {"content": parquet_df, "path": most_recent_file.path}
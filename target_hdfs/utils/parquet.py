@@ -1,11 +1,20 @@
 import os
+from collections.abc import Iterator
+
+
+def iter_parquet_files(dir_path: str) -> Iterator[str]:
+    """Yield the path of parquet files in the local directory (recursively)."""
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_parquet_files(entry.path)
+            elif entry.name.endswith(".parquet"):
+                yield entry.path
 
 
 def get_parquet_files(dir_path: str) -> list[str]:
     """Return the path of parquet files in the local directory."""
-    return [
-        os.path.join(root, file)
-        for root, dirs, files in os.walk(dir_path)
-        for file in files
-        if file.endswith(".parquet")
-    ]
+    try:
+        return sorted(iter_parquet_files(dir_path))
+    except FileNotFoundError:
+        return []
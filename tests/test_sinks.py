@@ -0,0 +1,167 @@
+"""Tests for the HDFS sink uploads."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from pathlib import Path
+
+import pytest
+from target_parquet.sinks import ParquetSink
+from target_parquet.target import TargetParquet
+
+from target_hdfs import sinks
+from target_hdfs.sinks import HDFSSink
+from target_hdfs.target import TargetHDFS
+
+SCHEMA = {"type": "object", "properties": {"id": {"type": ["integer", "null"]}}}
+
+
+@pytest.fixture(autouse=True)
+def clear_pending_uploads():
+    yield
+    sinks.PENDING_UPLOADS.clear()
+
+
+@pytest.fixture(autouse=True)
+def mock_read_most_recent_file(monkeypatch):
+    monkeypatch.setattr("target_hdfs.sinks.read_most_recent_file", lambda *args: None)
+
+
+@pytest.fixture(autouse=True)
+def mock_parquet_write_file(monkeypatch):
+    file_number = itertools.count()
+
+    def write_file(self):
+        Path(self.destination_path).mkdir(parents=True, exist_ok=True)
+        (Path(self.destination_path) / f"file_{next(file_number)}.parquet").touch()
+
+    monkeypatch.setattr(ParquetSink, "write_file", write_file)
+
+
+@pytest.fixture
+def uploaded_files(monkeypatch):
+    uploaded = []
+
+    def upload_to_hdfs(local_file, destination_path_hdfs):
+        uploaded.append(destination_path_hdfs)
+
+    monkeypatch.setattr("target_hdfs.sinks.upload_to_hdfs", upload_to_hdfs)
+    return uploaded
+
+
+@pytest.fixture
+def blocked_upload(monkeypatch):
+    """Fake upload that doesn't finish until the returned event is set."""
+    release_upload = threading.Event()
+    upload_finished = threading.Event()
+
+    def upload_to_hdfs(local_file, destination_path_hdfs):
+        release_upload.wait()
+        upload_finished.set()
+
+    monkeypatch.setattr("target_hdfs.sinks.upload_to_hdfs", upload_to_hdfs)
+    yield release_upload, upload_finished
+    # Never leave an upload thread hanging if an assertion failed
+    release_upload.set()
+
+
+def create_sink(tmp_path, **config) -> HDFSSink:
+    target = TargetHDFS(config={"hdfs_destination_path": "/hdfs/path", **config})
+    sink = HDFSSink(
+        target=target, stream_name="stream", schema=SCHEMA, key_properties=[]
+    )
+    sink.destination_path = str(tmp_path / "stream")
+    return sink
+
+
+def test_new_sink_waits_for_previous_sink_upload(tmp_path, monkeypatch, blocked_upload):
+    release_upload, upload_finished = blocked_upload
+    # e.g. the SDK creates a new sink for the stream after a schema change
+    create_sink(tmp_path).write_file()
+    uploaded_when_listing = []
+
+    def read_most_recent_file(*args):
+        uploaded_when_listing.append(upload_finished.is_set())
+
+    monkeypatch.setattr(
+        "target_hdfs.sinks.read_most_recent_file", read_most_recent_file
+    )
+    sink_creator = threading.Thread(target=create_sink, args=(tmp_path,))
+    sink_creator.start()
+    sink_creator.join(timeout=0.2)
+    # HDFS is not listed while the previous upload is still pending
+    assert uploaded_when_listing == []
+
+    release_upload.set()
+    sink_creator.join()
+    assert uploaded_when_listing == [True]
+
+
+def test_clean_up_waits_for_uploads(tmp_path, uploaded_files):
+    sink = create_sink(tmp_path)
+    sink.write_file()
+    sink.clean_up()
+
+    assert "/hdfs/path/stream/file_0.parquet" in uploaded_files
+    assert list(Path(sink.destination_path).glob("*.parquet")) == []
+
+
+def test_write_file_after_clean_up_uploads_synchronously(tmp_path, uploaded_files):
+    sink = create_sink(tmp_path)
+    sink.clean_up()
+    uploaded_files.clear()
+    sink.write_file()
+
+    assert len(uploaded_files) == 1
+    # A second clean up doesn't upload anything else
+    sink.clean_up()
+    assert len(uploaded_files) == 1
+
+
+def test_upload_error_is_raised(tmp_path, monkeypatch):
+    def upload_to_hdfs(local_file, destination_path_hdfs):
+        raise OSError("HDFS is down")
+
+    monkeypatch.setattr("target_hdfs.sinks.upload_to_hdfs", upload_to_hdfs)
+    sink = create_sink(tmp_path)
+    sink.write_file()
+
+    with pytest.raises(OSError, match="HDFS is down"):
+        sink.clean_up()
+
+
+@pytest.mark.parametrize("upload_concurrency", [0, -1, None, "x", ""])
+def test_invalid_upload_concurrency(tmp_path, upload_concurrency):
+    with pytest.raises(ValueError, match="hdfs_upload_concurrency"):
+        create_sink(tmp_path, hdfs_upload_concurrency=upload_concurrency)
+
+
+def test_upload_concurrency_from_string(tmp_path):
+    sink = create_sink(tmp_path, hdfs_upload_concurrency="4")
+
+    assert sink.upload_concurrency == 4
+
+
+def test_state_is_written_after_pending_uploads(tmp_path, monkeypatch, blocked_upload):
+    release_upload, upload_finished = blocked_upload
+    uploaded_when_writing_state = []
+
+    def write_state_message(self, state):
+        uploaded_when_writing_state.append(upload_finished.is_set())
+
+    monkeypatch.setattr(TargetParquet, "_write_state_message", write_state_message)
+    target = TargetHDFS(config={"hdfs_destination_path": "/hdfs/path"})
+    create_sink(tmp_path).write_file()
+
+    state_writer = threading.Thread(
+        target=target._write_state_message, args=({"bookmarks": {}},)
+    )
+    state_writer.start()
+    state_writer.join(timeout=0.2)
+    # No STATE while the upload is still pending
+    assert uploaded_when_writing_state == []
+
+    release_upload.set()
+    state_writer.join()
+    assert uploaded_when_writing_state == [True]
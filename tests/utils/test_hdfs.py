@@ -1,8 +1,18 @@
+import io
+import subprocess
+
 import pytest
-from pyarrow._fs import FileInfo
+from pyarrow._fs import FileInfo, FileType
 import pyarrow as pa
 
-from target_hdfs.utils.hdfs import read_most_recent_file, SchemaChangedError
+from target_hdfs.utils.hdfs import (
+    get_files,
+    get_hdfs_block_size,
+    read_hdfs_block_size_from_config,
+    read_most_recent_file,
+    replace_old_file_with_new_file,
+    SchemaChangedError,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -15,9 +25,28 @@ def mock_get_most_recent_file(monkeypatch):
     )
 
 
+class MockHDFSClient:
+    def __init__(self):
+        self.listing = {}
+        self.moves = []
+
+    def open_input_file(self, path):
+        return io.BytesIO()
+
+    def move(self, source, destination):
+        self.moves.append((source, destination))
+
+    def get_file_info(self, selector):
+        # The path is listed in a single call, without checking it exists first
+        assert selector.allow_not_found
+        return self.listing.get(selector.base_dir, [])
+
+
 @pytest.fixture(autouse=True)
-def mock_download_from_hdfs(monkeypatch):
-    monkeypatch.setattr("target_hdfs.utils.hdfs.download_from_hdfs", lambda *args: None)
+def mock_hdfs_client(monkeypatch):
+    hdfs_client = MockHDFSClient()
+    monkeypatch.setattr("target_hdfs.utils.hdfs.get_hdfs_client", lambda: hdfs_client)
+    return hdfs_client
 
 
 @pytest.fixture(autouse=True)
@@ -40,6 +69,34 @@ def mock_pa_parquet_read_table(monkeypatch):
     monkeypatch.setattr("pyarrow.parquet.read_table", mock_read_table)
 
 
+@pytest.fixture(autouse=True)
+def mock_pa_parquet_read_schema(monkeypatch):
+    def mock_read_schema(file):
+        return pa.schema(
+            [("col1", pa.int64()), ("col2", pa.string()), ("col3", pa.bool_())]
+        )
+
+    monkeypatch.setattr("pyarrow.parquet.read_schema", mock_read_schema)
+
+
+@pytest.fixture
+def write_hdfs_site(tmp_path, monkeypatch):
+    """Write hdfs-site.xml with the given properties and set HADOOP_CONF_DIR to it."""
+
+    def write_hdfs_site(properties):
+        (tmp_path / "hdfs-site.xml").write_text(
+            "<configuration>"
+            + "".join(
+                f"<property><name>{name}</name><value>{value}</value></property>"
+                for name, value in properties.items()
+            )
+            + "</configuration>"
+        )
+        monkeypatch.setenv("HADOOP_CONF_DIR", str(tmp_path))
+
+    return write_hdfs_site
+
+
 SCHEMA = pa.schema([("col1", pa.int64()), ("col2", pa.string()), ("col3", pa.bool_())])
 
 
@@ -86,3 +143,104 @@ def test_read_most_recent_file_schema_mismatch():
 
     with pytest.raises(SchemaChangedError):
         read_most_recent_file(hdfs_file_path, pyarrow_schema, hdfs_block_size_limit)
+
+
+def test_read_most_recent_file_schema_mismatch_does_not_read_table(monkeypatch):
+    # The table must not be decoded when the footer schema already differs
+    def fail_read_table(file):
+        raise AssertionError("read_table should not be called")
+
+    monkeypatch.setattr("pyarrow.parquet.read_table", fail_read_table)
+    pyarrow_schema = pa.schema([("col1", pa.int64())])
+
+    with pytest.raises(SchemaChangedError):
+        read_most_recent_file("/some/hdfs/path", pyarrow_schema, '1m')
+
+
+def test_read_hdfs_block_size_from_config(write_hdfs_site):
+    write_hdfs_site({"dfs.replication": "3", "dfs.blocksize": "256m"})
+
+    assert read_hdfs_block_size_from_config() == 256 * 1024 * 1024
+
+
+def test_read_hdfs_block_size_from_config_not_set(write_hdfs_site):
+    write_hdfs_site({"dfs.replication": "3"})
+
+    assert read_hdfs_block_size_from_config() is None
+
+
+@pytest.mark.parametrize("block_size", ["1t", "${dfs.default.blocksize}"])
+def test_read_hdfs_block_size_from_config_unsupported_value(
+    write_hdfs_site, block_size
+):
+    write_hdfs_site({"dfs.blocksize": block_size})
+
+    assert read_hdfs_block_size_from_config() is None
+
+
+def test_read_hdfs_block_size_from_config_no_conf_dir(monkeypatch):
+    monkeypatch.delenv("HADOOP_CONF_DIR", raising=False)
+    monkeypatch.delenv("HADOOP_HOME", raising=False)
+
+    assert read_hdfs_block_size_from_config() is None
+
+
+@pytest.fixture
+def mock_hdfs_getconf(monkeypatch):
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="134217728\n")
+
+    monkeypatch.setattr("target_hdfs.utils.hdfs.run", run)
+    get_hdfs_block_size.cache_clear()
+    yield commands
+    get_hdfs_block_size.cache_clear()
+
+
+def test_get_hdfs_block_size_from_config(write_hdfs_site, mock_hdfs_getconf):
+    write_hdfs_site({"dfs.blocksize": "256m"})
+
+    assert get_hdfs_block_size() == 256 * 1024 * 1024
+    assert mock_hdfs_getconf == []
+
+
+@pytest.mark.parametrize(
+    "properties", [{}, {"dfs.blocksize": "${dfs.default.blocksize}"}]
+)
+def test_get_hdfs_block_size_falls_back_to_getconf(
+    write_hdfs_site, mock_hdfs_getconf, properties
+):
+    write_hdfs_site(properties)
+
+    assert get_hdfs_block_size() == 128 * 1024 * 1024
+    assert mock_hdfs_getconf == [["hdfs", "getconf", "-confKey", "dfs.blocksize"]]
+
+
+def test_replace_old_file_with_new_file(mock_hdfs_client):
+    replace_old_file_with_new_file("/data/users_new/file.parquet_new")
+    assert mock_hdfs_client.moves == [
+        ("/data/users_new/file.parquet_new", "/data/users_new/file.parquet")
+    ]
+
+
+@pytest.fixture
+def mock_hdfs_listing(mock_hdfs_client):
+    mock_hdfs_client.listing = {
+        "/hdfs/path": [
+            FileInfo("/hdfs/path/file.parquet", type=FileType.File, size=10),
+            FileInfo("/hdfs/path/dataset.parquet", type=FileType.Directory),
+            FileInfo("/hdfs/path/file.parquet_new", type=FileType.File, size=10),
+            FileInfo("/hdfs/path/file.txt", type=FileType.File, size=10),
+        ]
+    }
+
+
+def test_get_files(mock_hdfs_listing):
+    files = get_files("/hdfs/path")
+    assert [file.path for file in files] == ["/hdfs/path/file.parquet"]
+
+
+def test_get_files_missing_path(mock_hdfs_listing):
+    assert get_files("/hdfs/missing") == []
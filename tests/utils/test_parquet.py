@@ -0,0 +1,17 @@
+from target_hdfs.utils.parquet import get_parquet_files
+
+
+def test_get_parquet_files(tmp_path):
+    (tmp_path / "col=a").mkdir()
+    (tmp_path / "col=a" / "file_2.parquet").touch()
+    (tmp_path / "file_1.parquet").touch()
+    (tmp_path / "file_1.txt").touch()
+
+    assert get_parquet_files(str(tmp_path)) == [
+        str(tmp_path / "col=a" / "file_2.parquet"),
+        str(tmp_path / "file_1.parquet"),
+    ]
+
+
+def test_get_parquet_files_missing_dir(tmp_path):
+    assert get_parquet_files(str(tmp_path / "missing")) == []
@@ -0,0 +1,24 @@
+import pytest
+
+from target_hdfs.utils import convert_size_to_bytes
+
+
+@pytest.mark.parametrize(
+    "size_str, expected",
+    [
+        ("134217728", 134217728),
+        ("512k", 512 * 1024),
+        ("200M", 200 * 1024 * 1024),
+        ("200MB", 200 * 1024 * 1024),
+        ("1g", 1024 * 1024 * 1024),
+        (" 128m\n", 128 * 1024 * 1024),
+    ],
+)
+def test_convert_size_to_bytes(size_str, expected):
+    assert convert_size_to_bytes(size_str) == expected
+
+
+@pytest.mark.parametrize("size_str", ["", "M", "1.5G", "10T", "10MM", "-1k"])
+def test_convert_size_to_bytes_invalid(size_str):
+    with pytest.raises(ValueError):
+        convert_size_to_bytes(size_str)